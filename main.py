@@ -1,23 +1,34 @@
 from fastapi import FastAPI
 from pydantic import BaseModel
-from typing import Dict, List, Optional
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from collections import deque
-import re
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import aiohttp
+import ahocorasick
+import orjson
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urldefrag, urljoin, urlparse, urlunparse
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from operator import itemgetter
 from fastapi import Depends, HTTPException, Security
+from fastapi.responses import Response
 from fastapi.security.api_key import APIKeyHeader
 import os
+import sys
+import time
 
 API_KEY_NAME = "X-API-Key"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
-VALID_API_KEYS = set(
+# read once at import; requests only do a hash lookup
+VALID_API_KEYS = frozenset(
     k.strip() for k in os.getenv("API_KEYS", "").split(",") if k.strip()
 )
 
-def get_api_key(api_key: str = Security(api_key_header)):
+def get_api_key(api_key: Optional[str] = Security(api_key_header)):
     if api_key in VALID_API_KEYS:
         return api_key
     raise HTTPException(status_code=403, detail="Invalid or missing API key")
@@ -25,10 +36,20 @@ def get_api_key(api_key: str = Security(api_key_header)):
 # FASTAPI APP
 # ----------------------------
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # HTTP connection pool and parsing process pool shared by every crawl
+    app.state.http = new_http_session()
+    app.state.pool = ProcessPoolExecutor()
+    yield
+    await app.state.http.close()
+    app.state.pool.shutdown()
+
 app = FastAPI(
     title="Persona Crawler API",
     description="Crawl a website and score pages by buyer persona.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # ----------------------------
@@ -37,32 +58,36 @@ app = FastAPI(
 
 PERSONAS = {
     "Fixer": {
-        "positive": ["fast", "instant", "today", "solve", "fix", "guarantee"],
-        "negative": ["maybe", "eventually", "could"],
-        "proof": ["guarantee", "delivery", "today"]
+        "positive": ("fast", "instant", "today", "solve", "fix", "guarantee"),
+        "negative": ("maybe", "eventually", "could"),
+        "proof": ("guarantee", "delivery", "today")
     },
     "Skeptic": {
-        "positive": ["reviews", "trusted", "refund", "returns", "policy"],
-        "negative": ["miracle", "hype"],
-        "proof": ["reviews", "refund", "returns"]
+        "positive": ("reviews", "trusted", "refund", "returns", "policy"),
+        "negative": ("miracle", "hype"),
+        "proof": ("reviews", "refund", "returns")
     },
     "Optimizer": {
-        "positive": ["results", "performance", "optimize", "data", "compare"],
-        "negative": ["generic"],
-        "proof": ["data", "study", "results"]
+        "positive": ("results", "performance", "optimize", "data", "compare"),
+        "negative": ("generic",),
+        "proof": ("data", "study", "results")
     },
     "Explorer": {
-        "positive": ["discover", "story", "learn", "why"],
-        "negative": [],
-        "proof": ["community", "story"]
+        "positive": ("discover", "story", "learn", "why"),
+        "negative": (),
+        "proof": ("community", "story")
     },
     "DealMax": {
-        "positive": ["save", "deal", "bundle", "discount", "off"],
-        "negative": [],
-        "proof": ["save", "deal", "bundle"]
+        "positive": ("save", "deal", "bundle", "discount", "off"),
+        "negative": (),
+        "proof": ("save", "deal", "bundle")
     }
 }
 
+PERSONA_NAMES = tuple(PERSONAS)
+BUCKETS = ("positive", "negative", "proof")
+BUCKET_WEIGHTS = (3, -4, 5)
+
 RECOMMENDATIONS = {
     "Fixer": {
         "overall_low": "Add a clear above-the-fold headline stating the problem you solve immediately.",
@@ -94,6 +119,15 @@ RECOMMENDATIONS = {
     }
 }
 
+ISSUES = ("overall_low", "missing_proof", "weak_language", "conflicting_language")
+OVERALL_LOW, MISSING_PROOF, WEAK_LANGUAGE, CONFLICTING_LANGUAGE = (1 << i for i in range(len(ISSUES)))
+
+# suggestion per [persona_idx][issue_idx], None where a persona has no advice for an issue
+REC_TABLE = tuple(
+    tuple(RECOMMENDATIONS.get(pname, {}).get(issue) for issue in ISSUES)
+    for pname in PERSONA_NAMES
+)
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -102,25 +136,66 @@ HEADERS = {
     )
 }
 
+CONCURRENCY = 32
+# per-socket limits only: the connector is shared by every crawl, and a total
+# timeout would also count time spent queued for a free pooled connection
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=10)
+FETCH_RETRIES = 1
+MAX_PAGE_BYTES = 2_000_000
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+CACHE_TTL = 3600
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# url -> (expires_at, etag, last_modified, final_url, html, body digest),
+# least recently used first;
+# HTTP_CACHE_BYTES is the in-memory size of the cached bodies
+HTTP_CACHE: "OrderedDict[str, Tuple[float, Optional[str], Optional[str], str, str, bytes]]" = OrderedDict()
+HTTP_CACHE_BYTES = 0
+
 # ----------------------------
 # UTILS
 # ----------------------------
 
-def clean_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    text = soup.get_text(separator=" ")
-    return re.sub(r"\s+", " ", text).lower()
-
-def count_hits(text: str, words: List[str]) -> int:
-    return sum(text.count(w) for w in words)
-
-def score_persona(text: str, persona: Dict) -> Dict:
-    pos = count_hits(text, persona["positive"])
-    neg = count_hits(text, persona["negative"])
-    proof = count_hits(text, persona["proof"])
-    raw_score = (pos * 3) + (proof * 5) - (neg * 4)
+def extract(html: str) -> Tuple[str, LexborHTMLParser]:
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(["script", "style", "noscript"])
+    text = tree.root.text(separator=" ")
+    return " ".join(text.split()).lower(), tree
+
+def build_keywords() -> List[Tuple[str, Tuple[Tuple[int, int], ...]]]:
+    # each distinct keyword once, with every (persona, bucket) slot it counts towards
+    targets: Dict[str, List[Tuple[int, int]]] = {}
+    for p_idx, pname in enumerate(PERSONA_NAMES):
+        for b_idx, bucket in enumerate(BUCKETS):
+            for word in PERSONAS[pname][bucket]:
+                targets.setdefault(word, []).append((p_idx, b_idx))
+    return [(word, tuple(slots)) for word, slots in targets.items()]
+
+KEYWORDS = build_keywords()
+
+def build_automaton() -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for k_idx, (word, _) in enumerate(KEYWORDS):
+        automaton.add_word(word, k_idx)
+    automaton.make_automaton()
+    return automaton
+
+AUTOMATON = build_automaton()
+
+def tally_hits(text: str) -> List[List[int]]:
+    # count matches per keyword entirely in C, then fold each matched
+    # keyword's count into its slots
+    hits = Counter(map(itemgetter(1), AUTOMATON.iter(text)))
+
+    tally = [[0, 0, 0] for _ in PERSONA_NAMES]
+    for k_idx, count in hits.items():
+        for p_idx, b_idx in KEYWORDS[k_idx][1]:
+            tally[p_idx][b_idx] += count
+    return tally
+
+def score_persona(pos: int, neg: int, proof: int) -> Dict:
+    w_pos, w_neg, w_proof = BUCKET_WEIGHTS
+    raw_score = (pos * w_pos) + (neg * w_neg) + (proof * w_proof)
     score = max(0, min(100, raw_score))
     return {
         "score": score,
@@ -129,16 +204,17 @@ def score_persona(text: str, persona: Dict) -> Dict:
         "proof_hits": proof,
     }
 
-def diagnose(score: float, pos: int, neg: int, proof: int) -> List[str]:
-    issues = []
+def diagnose(score: float, pos: int, neg: int, proof: int) -> int:
+    # bitmask over ISSUES
+    issues = 0
     if score < 50:
-        issues.append("overall_low")
+        issues |= OVERALL_LOW
     if proof == 0:
-        issues.append("missing_proof")
+        issues |= MISSING_PROOF
     if pos < 2:
-        issues.append("weak_language")
+        issues |= WEAK_LANGUAGE
     if neg > 0:
-        issues.append("conflicting_language")
+        issues |= CONFLICTING_LANGUAGE
     return issues
 
 def priority(score: float) -> str:
@@ -148,6 +224,30 @@ def priority(score: float) -> str:
         return "MEDIUM"
     return "LOW"
 
+def cache_ttl(cache_control: str) -> Optional[int]:
+    # seconds a response may be reused for; None when it must not be stored
+    directives = [d.strip().lower() for d in cache_control.split(",")]
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    for d in directives:
+        if d.startswith("max-age="):
+            try:
+                return max(0, int(d[len("max-age="):]))
+            except ValueError:
+                pass
+    return CACHE_TTL
+
+def normalize_url(url: str) -> str:
+    # drop fragment and tracking params, lowercase the host, strip trailing slash
+    parsed = urlparse(url)
+    query = "&".join(
+        kv for kv in parsed.query.split("&") if kv and not kv.startswith(TRACKING_PARAMS)
+    )
+    path = parsed.path.rstrip("/") or "/"
+    return urlunparse((parsed.scheme, parsed.netloc.lower(), path, parsed.params, query, ""))
+
 def detect_page_type(url: str) -> str:
     # very simple heuristic
     if url.endswith("/") or url.count("/") <= 3:
@@ -162,63 +262,231 @@ def detect_page_type(url: str) -> str:
 # CRAWLER CORE
 # ----------------------------
 
-def run_crawl(start_url: str, max_pages: int = 25) -> List[Dict]:
-    parsed_start = urlparse(start_url)
-    base_domain = parsed_start.netloc.replace("www.", "")
-
-    visited = set()
-    queue = deque([start_url])
-    pages: List[Dict] = []
-
-    while queue and len(visited) < max_pages:
-        url = queue.popleft()
-        if url in visited:
-            continue
-
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=10)
-            if resp.status_code != 200:
-                continue
-        except Exception:
-            continue
+def persona_result(p_idx: int, pos: int, neg: int, proof: int) -> Dict:
+    s = score_persona(pos, neg, proof)
+    mask = diagnose(s["score"], s["positive_hits"], s["negative_hits"], s["proof_hits"])
+    issues = []
+    suggestions = []
+    for i_idx, suggestion in enumerate(REC_TABLE[p_idx]):
+        if mask >> i_idx & 1:
+            issues.append(ISSUES[i_idx])
+            if suggestion:
+                suggestions.append(suggestion)
 
-        visited.add(url)
-        html = resp.text
-        text = clean_text(html)
+    return {
+        "score": float(s["score"]),
+        "priority": priority(s["score"]),
+        "issues": issues,
+        "suggestions": suggestions
+    }
 
-        page_info: Dict = {
-            "url": url,
-            "page_type": detect_page_type(url),
-            "personas": {}
-        }
+# result for a persona with no keyword hits on the page, which is the common case
+ZERO_RESULTS = tuple(persona_result(p_idx, 0, 0, 0) for p_idx in range(len(PERSONA_NAMES)))
 
-        for pname, persona in PERSONAS.items():
-            s = score_persona(text, persona)
-            issues = diagnose(s["score"], s["positive_hits"], s["negative_hits"], s["proof_hits"])
-            suggestions = []
-            if pname in RECOMMENDATIONS:
-                for issue in issues:
-                    if issue in RECOMMENDATIONS[pname]:
-                        suggestions.append(RECOMMENDATIONS[pname][issue])
+def score_page(url: str, text: str) -> Dict:
+    page_info: Dict = {
+        "url": url,
+        "page_type": detect_page_type(url),
+        "personas": {}
+    }
 
+    tally = tally_hits(text)
+    for p_idx, pname in enumerate(PERSONA_NAMES):
+        counts = tally[p_idx]
+        if any(counts):
+            page_info["personas"][pname] = persona_result(p_idx, *counts)
+        else:
+            # copy so no two pages share the precomputed dict or its lists
+            zero = ZERO_RESULTS[p_idx]
             page_info["personas"][pname] = {
-                "score": s["score"],
-                "priority": priority(s["score"]),
-                "issues": issues,
-                "suggestions": suggestions
+                **zero,
+                "issues": list(zero["issues"]),
+                "suggestions": list(zero["suggestions"])
             }
 
-        pages.append(page_info)
+    return page_info
 
-        # discover new links
-        soup = BeautifulSoup(html, "html.parser")
-        for a in soup.find_all("a", href=True):
-            link = urljoin(url, a["href"])
-            parsed_link = urlparse(link)
-            link_domain = parsed_link.netloc.replace("www.", "")
+def site_prefixes(base_domain: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    # absolute url prefixes that stay on the crawled site, plus its bare origins
+    origins = tuple(
+        f"{scheme}://{www}{base_domain}" for scheme in ("http", "https") for www in ("", "www.")
+    )
+    prefixes = tuple(origin + sep for origin in origins for sep in ("/", "?", "#"))
+    return prefixes, origins
+
+def process_page(
+    url: str,
+    base_url: str,
+    html: str,
+    site: Tuple[Tuple[str, ...], Tuple[str, ...]]
+) -> Tuple[Dict, List[Tuple[str, str]]]:
+    # CPU-bound half of a crawl step; runs in a worker process.
+    # hrefs resolve against base_url, the url the body was actually served
+    # from; links are (dedupe key, url to fetch) pairs
+    text, tree = extract(html)
+    page_info = score_page(url, text)
+
+    prefixes, origins = site
+    links = []
+    for node in tree.css("a[href]"):
+        link = urljoin(base_url, node.attributes.get("href") or "")
+        if link.startswith(prefixes) or link in origins:
+            links.append((normalize_url(link), urldefrag(link).url))
+
+    return page_info, links
+
+def new_http_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY, ttl_dns_cache=300)
+    return aiohttp.ClientSession(headers=HEADERS, connector=connector)
+
+def evict_page(url: str):
+    global HTTP_CACHE_BYTES
+    previous = HTTP_CACHE.pop(url, None)
+    if previous is not None:
+        HTTP_CACHE_BYTES -= sys.getsizeof(previous[4])
+
+def cache_page(
+    url: str,
+    final_url: str,
+    html: str,
+    digest: bytes,
+    etag: Optional[str],
+    last_modified: Optional[str],
+    cache_control: str
+):
+    global HTTP_CACHE_BYTES
+    evict_page(url)
+
+    ttl = cache_ttl(cache_control)
+    size = sys.getsizeof(html)
+    if ttl is None or size > CACHE_MAX_BYTES:
+        return
+    HTTP_CACHE[url] = (time.monotonic() + ttl, etag, last_modified, final_url, html, digest)
+    HTTP_CACHE_BYTES += size
+
+    # evict least recently used bodies until back under the memory budget
+    while HTTP_CACHE_BYTES > CACHE_MAX_BYTES:
+        _, evicted = HTTP_CACHE.popitem(last=False)
+        HTTP_CACHE_BYTES -= sys.getsizeof(evicted[4])
+
+async def fetch_html(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    url: str
+) -> Optional[Tuple[str, str, bytes]]:
+    # returns (final url after redirects, html, blake2b digest of the raw body)
+    cached = HTTP_CACHE.get(url)
+    if cached is not None:
+        expires_at, etag, last_modified, cached_final_url, cached_html, cached_digest = cached
+        if expires_at > time.monotonic():
+            HTTP_CACHE.move_to_end(url)
+            return cached_final_url, cached_html, cached_digest
+
+    # revalidate a stale entry with a conditional GET
+    headers = {}
+    if cached is not None:
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    async with sem:
+        for attempt in range(FETCH_RETRIES + 1):
+            try:
+                async with session.get(url, headers=headers, timeout=FETCH_TIMEOUT) as resp:
+                    final_url = str(resp.url)
+                    truncated = False
+                    if resp.status == 304 and cached is not None:
+                        html = cached_html
+                        digest = cached_digest
+                        etag = resp.headers.get("ETag", etag)
+                        last_modified = resp.headers.get("Last-Modified", last_modified)
+                    else:
+                        if resp.status != 200 or resp.content_type != "text/html":
+                            return None
+                        if (resp.content_length or 0) > MAX_PAGE_BYTES:
+                            return None
+
+                        # stream the body and stop reading once the cap is hit
+                        buf = bytearray()
+                        async for chunk in resp.content.iter_chunked(65536):
+                            buf += chunk
+                            if len(buf) >= MAX_PAGE_BYTES:
+                                truncated = True
+                                break
+                        html = buf.decode(resp.charset or "utf-8", errors="replace")
+                        digest = hashlib.blake2b(buf, digest_size=16).digest()
+                        etag = resp.headers.get("ETag")
+                        last_modified = resp.headers.get("Last-Modified")
+
+                    if truncated:
+                        # a body cut off at the cap must never be revalidated as complete
+                        evict_page(url)
+                    else:
+                        cache_page(
+                            url, final_url, html, digest, etag, last_modified,
+                            resp.headers.get("Cache-Control", "")
+                        )
+                    return final_url, html, digest
+            except aiohttp.ClientConnectionError:
+                # a pooled keep-alive connection may have been closed by the server
+                if attempt == FETCH_RETRIES:
+                    raise
+                await asyncio.sleep(0.2)
+
+async def run_crawl(
+    start_url: str,
+    max_pages: int = 25,
+    session: Optional[aiohttp.ClientSession] = None,
+    pool: Optional[Executor] = None
+) -> List[Dict]:
+    if session is None:
+        async with new_http_session() as session:
+            return await run_crawl(start_url, max_pages, session, pool)
+
+    # urls are fetched and reported as discovered (minus the fragment);
+    # normalize_url only provides the key they are deduplicated on
+    start_url = urldefrag(start_url).url
+    start_key = normalize_url(start_url)
+    site = site_prefixes(urlparse(start_key).netloc.replace("www.", ""))
+    # urls are marked seen when queued, so the frontier never holds duplicates
+    seen = {start_key}
+    queue = deque([start_url])
+    pages: List[Dict] = []
+    scored: Dict[bytes, asyncio.Future] = {}
+    sem = asyncio.Semaphore(CONCURRENCY)
+    loop = asyncio.get_running_loop()
+
+    while queue and len(pages) < max_pages:
+        batch = [queue.popleft() for _ in range(min(len(queue), max_pages - len(pages)))]
+
+        results = await asyncio.gather(
+            *(fetch_html(session, sem, url) for url in batch),
+            return_exceptions=True
+        )
+
+        # parse and score the round in parallel, off the event loop; a body
+        # already seen in this crawl reuses the result of its first copy
+        round_pages = []
+        for url, fetched in zip(batch, results):
+            if not isinstance(fetched, tuple):
+                continue
+            final_url, html, digest = fetched
+            first = digest not in scored
+            if first:
+                scored[digest] = loop.run_in_executor(pool, process_page, url, final_url, html, site)
+            round_pages.append((url, digest, first))
+
+        for url, digest, first in round_pages:
+            page_info, links = await scored[digest]
+            if not first:
+                pages.append({**page_info, "url": url, "page_type": detect_page_type(url)})
+                continue
 
-            if link_domain == "" or link_domain == base_domain:
-                if link not in visited:
+            pages.append(page_info)
+            for key, link in links:
+                if key not in seen:
+                    seen.add(key)
                     queue.append(link)
 
     return pages
@@ -251,15 +519,25 @@ class CrawlResponse(BaseModel):
 # API ENDPOINT
 # ----------------------------
 
-@app.post("/crawl", response_model=CrawlResponse)
-def crawl_site(req: CrawlRequest, api_key: str = Depends(get_api_key)):
-    pages_raw = run_crawl(req.url, req.max_pages)
-    # FastAPI + Pydantic will validate/convert automatically
-    return CrawlResponse(
-        start_url=req.url,
-        max_pages=req.max_pages,
-        pages=pages_raw
-    )
+# run_crawl output is trusted, so CrawlResponse only documents the schema;
+# the body is encoded straight to JSON, skipping validation and jsonable_encoder
+@app.post("/crawl", response_model=None, responses={200: {"model": CrawlResponse}})
+async def crawl_site(req: CrawlRequest, api_key: str = Depends(get_api_key)):
+    pool = app.state.pool
+    try:
+        pages_raw = await run_crawl(req.url, req.max_pages, app.state.http, pool)
+    except BrokenProcessPool:
+        # a worker died mid-crawl; swap in a fresh pool so only this crawl fails
+        if app.state.pool is pool:
+            app.state.pool = ProcessPoolExecutor()
+        pool.shutdown(wait=False)
+        raise HTTPException(status_code=502, detail="Page processing failed during crawl")
+    payload = {
+        "start_url": req.url,
+        "max_pages": req.max_pages,
+        "pages": pages_raw
+    }
+    return Response(orjson.dumps(payload), media_type="application/json")
 
 @app.get("/")
 def root():